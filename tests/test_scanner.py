@@ -4,42 +4,178 @@ Comprehensive test suite for Solana Repository Security Scanner
 Tests various scenarios including legitimate projects, scams, and edge cases
 """
 
+import copy
+import functools
+import json
 import unittest
 import sys
 import os
+from datetime import datetime, timedelta
 
-# Add parent directory to path to import analyze module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import requests
+import responses
+from responses import matchers
 
 from analyze import SolanaRepoScanner
 
+# Live-network tests are opt-in: they burn GitHub rate limit, need
+# connectivity, and dominate suite wall time. Everything else runs
+# against the mocked fixtures below.
+_ONLINE = os.getenv("SCANNER_TEST_ONLINE") == "1"
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Canned API payloads for the repos the suite leans on, keyed by scan
+# URL: fixture directory, true commit total, and the author pool used
+# to synthesize the commit page. Commit dates are generated fresh per
+# run because the recency check compares against the current clock.
+_FIXTURE_REPOS = {
+    "https://github.com/solana-labs/solana": (
+        "solana-labs__solana", 65000,
+        ("alice@solana.example", "bob@solana.example", "carol@solana.example"),
+    ),
+    "https://github.com/coral-xyz/anchor": (
+        "coral-xyz__anchor", 3100,
+        ("armani@example.com", "paul@example.com"),
+    ),
+    "https://github.com/Momo111psy/cai": (
+        "Momo111psy__cai", 40,
+        ("momo@example.com",),
+    ),
+}
+
+# Neutral README body: long enough to pass the length check, free of
+# marketing/funding/token keywords
+_README_BODY = (
+    "# Project\n\n"
+    "A high-performance blockchain runtime written in Rust.\n\n"
+    "See the documentation site for build instructions, architecture "
+    "notes, and the validator setup guide. Run the full test suite "
+    "with cargo before sending patches, and read the style guide for "
+    "formatting rules.\n"
+)
+
+
+def _fixture(dirname, name):
+    """Load a canned JSON payload from tests/fixtures"""
+    with open(os.path.join(FIXTURE_DIR, dirname, name)) as fh:
+        return json.load(fh)
+
+
+def _fake_commits(count, authors):
+    """Synthesize a recent commit page cycling through the author pool"""
+    now = datetime.utcnow()
+    return [
+        {"commit": {"author": {
+            "email": authors[i % len(authors)],
+            "date": (now - timedelta(days=i + 1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }}}
+        for i in range(count)
+    ]
+
+
+def _register_repo(rsps, url):
+    """Register every endpoint a scan of url touches with responses"""
+    dirname, total, authors = _FIXTURE_REPOS[url]
+    owner, repo = dirname.split("__")
+    base = f"https://api.github.com/repos/{owner}/{repo}"
+    commits = _fake_commits(min(total, 50), authors)
+
+    rsps.add(responses.GET, base, json=_fixture(dirname, "repo.json"))
+    # per_page=1 probe: the Link rel="last" page number carries the total
+    rsps.add(
+        responses.GET, f"{base}/commits", json=commits[:1],
+        headers={"Link": f'<{base}/commits?per_page=1&page={total}>; rel="last"'},
+        match=[matchers.query_param_matcher({"per_page": "1"})],
+    )
+    rsps.add(
+        responses.GET, f"{base}/commits", json=commits,
+        match=[matchers.query_param_matcher({"per_page": "100"})],
+    )
+    rsps.add(responses.GET, f"{base}/languages",
+             json=_fixture(dirname, "languages.json"))
+    rsps.add(responses.GET, f"{base}/contents",
+             json=_fixture(dirname, "contents.json"))
+    rsps.add(
+        responses.GET,
+        f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
+        body=_README_BODY,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _scanned(url):
+    """Analyze a URL once per test run and share the result.
+
+    Repos with canned fixtures are scanned entirely against mocked HTTP,
+    which is deterministic and immune to rate limits; anything else
+    still hits the live API. Returns the scanner and its result dict.
+    """
+    if url in _FIXTURE_REPOS:
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            _register_repo(rsps, url)
+            scanner = SolanaRepoScanner(url, quiet=True, session=requests.Session())
+            return scanner, scanner.analyze()
+    scanner = SolanaRepoScanner(url)
+    return scanner, scanner.analyze()
+
+
+def _fetched_scanner(url):
+    """Fresh scanner with metadata, commits and languages loaded from
+    fixtures, ready for individual check_* methods to run against"""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        _register_repo(rsps, url)
+        scanner = SolanaRepoScanner(url, quiet=True, session=requests.Session())
+        scanner.parse_url()
+        scanner.fetch_repo_data()
+        scanner.fetch_commits()
+        # The checks read prefetched languages rather than fetching
+        # their own, so pull the mocked endpoint here too - otherwise
+        # the ratio check divides 0 LOC and can never flag anything
+        lang_resp = scanner.session.get(scanner._urls()["languages"], timeout=10)
+        if lang_resp.status_code == 200:
+            scanner.languages = lang_resp.json()
+    return scanner
+
+
+# URL-parsing cases: (url, expected (owner, repo) or None for a reject).
+# One parametrized test replaces a test method per case; parse_url is
+# pure CPU, so each row costs microseconds
+_URL_CASES = [
+    ("https://github.com/solana-labs/solana", ("solana-labs", "solana")),
+    ("https://github.com/coral-xyz/anchor.git", ("coral-xyz", "anchor")),
+    ("https://invalid-url.com/repo", None),
+    ("", None),
+    ("not-a-url", None),
+    ("github.com/solana-labs/solana", ("solana-labs", "solana")),
+    ("https://www.github.com/solana-labs/solana", ("solana-labs", "solana")),
+    ("https://github.com/solana-labs/solana/", ("solana-labs", "solana")),
+    ("https://github.com/coral-xyz/anchor/tree/master/lang", ("coral-xyz", "anchor")),
+    ("https://github.com/coral-xyz/anchor?tab=readme-ov-file", ("coral-xyz", "anchor")),
+    ("http://github.com/solana-labs/solana", ("solana-labs", "solana")),
+    ("https://evil.com/github.com/solana-labs/solana", None),
+    ("https://github.com/solana-labs", None),
+]
+
+
+@pytest.mark.parametrize("url,expected", _URL_CASES)
+def test_url_parsing(url, expected):
+    """Table-driven check of parse_url acceptance and extraction"""
+    scanner = SolanaRepoScanner(url)
+    if expected is None:
+        assert not scanner.parse_url()
+    else:
+        assert scanner.parse_url()
+        assert (scanner.owner, scanner.repo) == expected
+
 
 class TestSolanaRepoScanner(unittest.TestCase):
     """Test cases for Solana Repository Security Scanner"""
-    
-    def test_url_parsing_valid(self):
-        """Test valid GitHub URL parsing"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        self.assertTrue(scanner.parse_url())
-        self.assertEqual(scanner.owner, "solana-labs")
-        self.assertEqual(scanner.repo, "solana")
-    
-    def test_url_parsing_with_git_extension(self):
-        """Test URL parsing with .git extension"""
-        scanner = SolanaRepoScanner("https://github.com/coral-xyz/anchor.git")
-        self.assertTrue(scanner.parse_url())
-        self.assertEqual(scanner.owner, "coral-xyz")
-        self.assertEqual(scanner.repo, "anchor")
-    
-    def test_url_parsing_invalid(self):
-        """Test invalid URL handling"""
-        scanner = SolanaRepoScanner("https://invalid-url.com/repo")
-        self.assertFalse(scanner.parse_url())
-    
+
     def test_legitimate_project_solana_labs(self):
         """Test analysis of legitimate Solana Labs repository"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        result = scanner.analyze()
+        _scanner, result = _scanned("https://github.com/solana-labs/solana")
         
         self.assertNotIn("error", result)
         self.assertGreaterEqual(result["score"], 60)  # Should have decent score
@@ -47,29 +183,26 @@ class TestSolanaRepoScanner(unittest.TestCase):
     
     def test_legitimate_project_anchor(self):
         """Test analysis of legitimate Anchor framework repository"""
-        scanner = SolanaRepoScanner("https://github.com/coral-xyz/anchor")
-        result = scanner.analyze()
+        _scanner, result = _scanned("https://github.com/coral-xyz/anchor")
         
         self.assertNotIn("error", result)
         self.assertGreaterEqual(result["score"], 60)
         self.assertIn("LOW", result["risk_level"])
     
+    @unittest.skipUnless(_ONLINE, "live GitHub API; set SCANNER_TEST_ONLINE=1")
     def test_low_commit_detection(self):
         """Test detection of suspiciously low commit counts"""
         # Using a known test case with low commits
-        scanner = SolanaRepoScanner("https://github.com/Momo111psy/solguard-ai")
-        result = scanner.analyze()
-        
+        scanner, result = _scanned("https://github.com/Momo111psy/solguard-ai")
+
         self.assertNotIn("error", result)
         # Should detect low commit count as a red flag
-        self.assertTrue(any("commit" in flag.lower() for flag in result["red_flags"]))
+        self.assertIn("low_commits", scanner.red_flag_tags)
     
     def test_risk_level_calculation(self):
         """Test risk level categorization"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        scanner.parse_url()
-        scanner.fetch_repo_data()
-        
+        scanner = _fetched_scanner("https://github.com/solana-labs/solana")
+
         # Test different score ranges
         scanner.score = 85
         risk_level, emoji = scanner.get_risk_level()
@@ -88,8 +221,7 @@ class TestSolanaRepoScanner(unittest.TestCase):
     
     def test_community_engagement_metrics(self):
         """Test that community metrics are properly fetched"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        result = scanner.analyze()
+        _scanner, result = _scanned("https://github.com/solana-labs/solana")
         
         self.assertNotIn("error", result)
         self.assertGreater(result["metadata"]["stars"], 0)
@@ -98,130 +230,128 @@ class TestSolanaRepoScanner(unittest.TestCase):
     
     def test_nonexistent_repo(self):
         """Test handling of non-existent repository"""
-        scanner = SolanaRepoScanner("https://github.com/nonexistent-user-12345/nonexistent-repo-67890")
-        result = scanner.analyze()
-        
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            # The fail-fast HEAD probe is all analyze() should need
+            rsps.add(
+                responses.HEAD,
+                "https://api.github.com/repos/nonexistent-user-12345/nonexistent-repo-67890",
+                status=404,
+            )
+            scanner = SolanaRepoScanner(
+                "https://github.com/nonexistent-user-12345/nonexistent-repo-67890",
+                quiet=True, session=requests.Session())
+            result = scanner.analyze()
+
         self.assertIn("error", result)
     
     def test_score_bounds(self):
         """Test that score stays within 0-100 bounds"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        scanner.parse_url()
-        scanner.fetch_repo_data()
-        scanner.fetch_commits()
-        
-        # Artificially set extreme scores
+        scanner = _fetched_scanner("https://github.com/solana-labs/solana")
+
+        # Artificially set extreme scores; the property clamps them
         scanner.score = 150
-        scanner.score = max(0, min(100, scanner.score))
         self.assertLessEqual(scanner.score, 100)
-        
+
         scanner.score = -50
-        scanner.score = max(0, min(100, scanner.score))
         self.assertGreaterEqual(scanner.score, 0)
     
     def test_fork_detection(self):
         """Test detection of forked repositories"""
         # Test with a known fork (if available)
-        scanner = SolanaRepoScanner("https://github.com/Momo111psy/cai")
-        result = scanner.analyze()
+        scanner, result = _scanned("https://github.com/Momo111psy/cai")
         
         self.assertNotIn("error", result)
         # Should detect if repo is a fork
         if scanner.repo_data.get("fork", False):
-            self.assertTrue(any("fork" in flag.lower() for flag in result["red_flags"]))
-
-
-class TestEdgeCases(unittest.TestCase):
-    """Test edge cases and error handling"""
-    
-    def test_empty_url(self):
-        """Test handling of empty URL"""
-        scanner = SolanaRepoScanner("")
-        self.assertFalse(scanner.parse_url())
-    
-    def test_malformed_url(self):
-        """Test handling of malformed URL"""
-        scanner = SolanaRepoScanner("not-a-url")
-        self.assertFalse(scanner.parse_url())
-    
-    def test_github_url_without_protocol(self):
-        """Test URL without https:// protocol"""
-        scanner = SolanaRepoScanner("github.com/solana-labs/solana")
-        self.assertTrue(scanner.parse_url())
-        self.assertEqual(scanner.owner, "solana-labs")
+            self.assertIn("fork", scanner.red_flag_tags)
 
 
 class TestSecurityChecks(unittest.TestCase):
     """Test specific security check functions"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # One shared fetch for the whole class; each test works on a
+        # deep copy so score/red_flags mutations stay isolated
+        cls._base = _fetched_scanner("https://github.com/solana-labs/solana")
+        # Sessions hold sockets and don't survive deepcopy
+        cls._base._session = None
+
+    def setUp(self):
+        self.scanner = copy.deepcopy(self._base)
+
     def test_code_to_commit_ratio_check(self):
         """Test code-to-commit ratio detection"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        scanner.parse_url()
-        scanner.fetch_repo_data()
-        scanner.fetch_commits()
-        
+        scanner = self.scanner
+
         # Run the check
         scanner.check_code_to_commit_ratio()
-        
+
         # For legitimate projects, should not flag extreme ratios
-        extreme_flags = [flag for flag in scanner.red_flags if "Extreme" in flag]
-        self.assertEqual(len(extreme_flags), 0)
-    
+        self.assertNotIn("extreme_ratio", scanner.red_flag_tags)
+
     def test_commit_pattern_analysis(self):
         """Test commit pattern analysis"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        scanner.parse_url()
-        scanner.fetch_repo_data()
-        scanner.fetch_commits()
-        
+        scanner = self.scanner
+
         initial_score = scanner.score
         scanner.check_commit_patterns()
-        
+
         # For active repos, score should not decrease significantly
         self.assertGreaterEqual(scanner.score, initial_score - 20)
-    
+
     def test_license_check(self):
         """Test license detection"""
-        scanner = SolanaRepoScanner("https://github.com/solana-labs/solana")
-        scanner.parse_url()
-        scanner.fetch_repo_data()
-        
+        scanner = self.scanner
+
         scanner.check_license_and_docs()
-        
+
         # Solana repo should have a license
-        license_flags = [flag for flag in scanner.red_flags if "license" in flag.lower()]
-        self.assertEqual(len(license_flags), 0)
+        self.assertNotIn("no_license", scanner.red_flag_tags)
 
 
 def run_integration_tests():
     """Run integration tests on real repositories"""
+    import concurrent.futures
+
     print("\n" + "="*70)
     print("🧪 RUNNING INTEGRATION TESTS")
     print("="*70 + "\n")
-    
+
     test_repos = [
         ("https://github.com/solana-labs/solana", "Solana Labs - Main Repository"),
         ("https://github.com/coral-xyz/anchor", "Anchor Framework"),
         ("https://github.com/Momo111psy/MOLTVAULT", "MOLTVAULT"),
         ("https://github.com/Momo111psy/solguard-ai", "SolGuard AI"),
     ]
-    
-    for repo_url, name in test_repos:
-        print(f"\n{'='*70}")
-        print(f"Testing: {name}")
-        print(f"URL: {repo_url}")
-        print("="*70)
-        
-        scanner = SolanaRepoScanner(repo_url)
-        result = scanner.analyze()
-        
-        if "error" not in result:
-            print(f"✅ Test passed - Score: {result['score']}/100")
-        else:
-            print(f"⚠️  Test completed with error: {result['error']}")
-        
-        print()
+
+    # One aliased GraphQL POST prefetches metadata for the whole set
+    # when a GITHUB_TOKEN is available; without one this degrades to
+    # plain per-repo scanners
+    scanners = SolanaRepoScanner.bulk_fetch([url for url, _name in test_repos])
+
+    # Each scan is network-latency bound, so overlap them; max_workers
+    # stays under GitHub's ~5 concurrent-connection secondary rate limit
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(scanner.analyze): (url, name)
+            for scanner, (url, name) in zip(scanners, test_repos)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            repo_url, name = futures[future]
+            result = future.result()
+
+            print(f"\n{'='*70}")
+            print(f"Testing: {name}")
+            print(f"URL: {repo_url}")
+            print("="*70)
+
+            if "error" not in result:
+                print(f"✅ Test passed - Score: {result['score']}/100")
+            else:
+                print(f"⚠️  Test completed with error: {result['error']}")
+
+            print()
 
 
 if __name__ == "__main__":
@@ -230,21 +360,44 @@ if __name__ == "__main__":
     print("🧪 SOLANA REPOSITORY SCANNER - TEST SUITE")
     print("="*70 + "\n")
     
+    if _ONLINE:
+        import concurrent.futures
+
+        # Warm the live repos before the runner starts. Two reuse
+        # mechanisms follow: test_low_commit_detection reads the
+        # _scanned memo directly, and the integration phase's re-scans
+        # are served from the on-disk cache (fresh within its TTL)
+        # rather than re-downloading bodies. Note the GraphQL bulk
+        # prefetch is uncached, so with a GITHUB_TOKEN only the README
+        # fetches benefit from the warm cache.
+        # Fixture-backed repos need no network and are not warmed.
+        prefetch_urls = [
+            "https://github.com/Momo111psy/solguard-ai",
+            "https://github.com/Momo111psy/MOLTVAULT",
+        ]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            for url in prefetch_urls:
+                executor.submit(_scanned, url)
+
     # Create test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
     
-    # Add all test cases
+    # Add all test cases (the parametrized URL tests run under pytest)
     suite.addTests(loader.loadTestsFromTestCase(TestSolanaRepoScanner))
-    suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))
     suite.addTests(loader.loadTestsFromTestCase(TestSecurityChecks))
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
+    # Run tests. CI gets buffered, per-test-silent output (no stdout
+    # flush per test, no interleaving under parallel runs); local runs
+    # keep the chatty per-test listing for debugging
+    if os.getenv("CI"):
+        runner = unittest.TextTestRunner(verbosity=1, buffer=True)
+    else:
+        runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     
-    # Run integration tests if unit tests pass
-    if result.wasSuccessful():
+    # Run integration tests if unit tests pass (live API, opt-in)
+    if result.wasSuccessful() and _ONLINE:
         run_integration_tests()
     
     # Exit with appropriate code